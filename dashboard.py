@@ -3,10 +3,70 @@ import pandas as pd
 import plotly.express as px
 import os
 import io
-from data_quality_checker import DataQualityChecker
+from data_quality_checker import DataQualityChecker, read_csv
 
 st.set_page_config(page_title="Data Quality Dashboard", layout="wide")
 
+# Bar charts beyond this many columns are cut to the largest values unless expanded
+MAX_BARS = 50
+
+# ---------------------------------------------------------
+# Cached analysis
+# ---------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def analyze(file_bytes: bytes, file_name: str) -> tuple[dict, str]:
+    """Load a dataset from raw file bytes and run all checks (cached on the bytes)"""
+    buffer = io.BytesIO(file_bytes)
+    if file_name.endswith(".csv"):
+        df = read_csv(buffer)
+    elif file_name.endswith(".xlsx"):
+        df = pd.read_excel(buffer, engine="calamine")
+    elif file_name.endswith(".parquet"):
+        df = pd.read_parquet(buffer)
+    else:
+        raise ValueError("Unsupported file format. Use CSV, XLSX, or PARQUET.")
+
+    checker = DataQualityChecker(df=df, file_name=file_name)
+    report = checker.run_all_checks()
+    text_report = checker.generate_text_report()
+    return report, text_report
+
+
+@st.cache_data(show_spinner=False)
+def build_pdf(report: dict, file_name: str) -> bytes:
+    """Render the PDF report from an already computed quality report"""
+    checker = DataQualityChecker(file_name=file_name)
+    checker.quality_report = report
+    return checker.get_pdf_bytes().getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def bar_figure(data: pd.DataFrame, y: str, title: str, color_scale: str):
+    """Build a per-column percentage bar chart (cached so reruns reuse the same figure)"""
+    fig = px.bar(
+        data,
+        x="Column",
+        y=y,
+        title=title,
+        text=y,
+        color=y,
+        color_continuous_scale=color_scale,
+        height=500
+    )
+    fig.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
+    fig.update_layout(xaxis_tickangle=-45, yaxis_tickformat=".2f", margin=dict(t=120, b=100, l=60, r=40))
+    return fig
+
+
+def chart_rows(data: pd.DataFrame, y: str, key: str) -> pd.DataFrame:
+    """Limit wide datasets to the MAX_BARS largest values unless the user expands the chart"""
+    if len(data) <= MAX_BARS:
+        return data
+    if st.toggle(f"Show all {len(data)} columns", key=key):
+        return data
+    st.caption(f"Showing the top {MAX_BARS} of {len(data)} columns by {y.replace('_', ' ')}.")
+    return data.nlargest(MAX_BARS, y)
+
 # ---------------------------------------------------------
 # App Header
 # ---------------------------------------------------------
@@ -32,45 +92,35 @@ if not uploaded_file and sample_files:
     selected_sample = st.selectbox("Or choose a sample dataset", sample_files)
 
 # ---------------------------------------------------------
-# Load the dataset into a DataFrame
+# Read the raw file bytes
 # ---------------------------------------------------------
-df = None
+file_bytes = None
 file_name = None
 
-try:
-    if uploaded_file:
-        file_name = uploaded_file.name
-        if file_name.endswith(".csv"):
-            df = pd.read_csv(uploaded_file)
-        elif file_name.endswith(".xlsx"):
-            df = pd.read_excel(uploaded_file)
-        elif file_name.endswith(".parquet"):
-            df = pd.read_parquet(uploaded_file)
-    elif selected_sample:
-        file_name = selected_sample
-        sample_path = os.path.join(sample_folder, selected_sample)
-        if selected_sample.endswith(".csv"):
-            df = pd.read_csv(sample_path)
-        elif selected_sample.endswith(".xlsx"):
-            df = pd.read_excel(sample_path)
-        elif selected_sample.endswith(".parquet"):
-            df = pd.read_parquet(sample_path)
-except Exception as e:
-    st.error(f"❌ Error loading file: {e}")
+if uploaded_file:
+    file_name = uploaded_file.name
+    file_bytes = uploaded_file.getvalue()
+elif selected_sample:
+    file_name = selected_sample
+    with open(os.path.join(sample_folder, selected_sample), "rb") as f:
+        file_bytes = f.read()
 
 # ---------------------------------------------------------
-# Run Analysis if a DataFrame is loaded
+# Run Analysis (cached per file contents)
 # ---------------------------------------------------------
-if df is not None:
-    with st.spinner("🔍 Analyzing dataset..."):
-        checker = DataQualityChecker(df=df, file_name=file_name)
-        report = checker.run_all_checks()
-        text_report = checker.generate_text_report()
-
+report = None
+if file_bytes is not None:
+    try:
+        with st.spinner("🔍 Analyzing dataset..."):
+            report, text_report = analyze(file_bytes, file_name)
+    except Exception as e:
+        st.error(f"❌ Error loading file: {e}")
+
+if report is not None:
     # ------------------------- Basic Info -------------------------
     basic_info = report.get("basic_info", {})
     st.success(f"✅ File analyzed successfully: **{basic_info.get('file_name', file_name)}**")
-    st.write(f"**Rows:** {basic_info.get('total_rows', len(df)):,}  |  **Columns:** {basic_info.get('total_columns', len(df.columns))}")
+    st.write(f"**Rows:** {basic_info.get('total_rows', 0):,}  |  **Columns:** {basic_info.get('total_columns', 0)}")
     st.caption(f"Generated on: {basic_info.get('load_timestamp', '')}")
     st.info("This section shows basic file information and dataset dimensions.")
 
@@ -81,28 +131,14 @@ if df is not None:
 
     # ------------------------- Missing Values -------------------------
     st.subheader("🔍 Missing Values Overview")
-    missing_df = pd.DataFrame({
-        "Column": report["missing_values"]["missing_by_column"].keys(),
-        "Missing Count": report["missing_values"]["missing_by_column"].values(),
-        "Missing %": report["missing_values"]["missing_percentage_by_column"].values()
-    })
-    missing_df["Missing %"] = pd.to_numeric(missing_df["Missing %"], errors="coerce").fillna(0).round(2)
+    missing_df = report["missing_values_table"]
+    missing_df["Missing %"] = missing_df["Missing %"].fillna(0).round(2)
     st.dataframe(missing_df, width='stretch')
 
     if not missing_df.empty:
-        fig_missing = px.bar(
-            missing_df,
-            x="Column",
-            y="Missing %",
-            title="Missing Percentage by Column",
-            text="Missing %",
-            color="Missing %",
-            color_continuous_scale="Reds",
-            height=500
-        )
-        fig_missing.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
-        fig_missing.update_layout(xaxis_tickangle=-45, yaxis_tickformat=".2f", margin=dict(t=120, b=100, l=60, r=40))
-        st.plotly_chart(fig_missing, width='stretch')
+        missing_chart = chart_rows(missing_df, "Missing %", "missing_all")
+        fig_missing = bar_figure(missing_chart, "Missing %", "Missing Percentage by Column", "Reds")
+        st.plotly_chart(fig_missing, width='stretch', key="missing_bar")
 
     # ------------------------- Outlier Visualization -------------------------
     st.subheader("📊 Numeric Outliers")
@@ -110,71 +146,43 @@ if df is not None:
     if not outlier_df.empty:
         outlier_df["outlier_percentage"] = pd.to_numeric(outlier_df["outlier_percentage"], errors="coerce").fillna(0).round(2)
         st.dataframe(outlier_df, width='stretch')
-        fig_outliers = px.bar(
-            outlier_df,
-            x="Column",
-            y="outlier_percentage",
-            title="Outlier Percentage by Column",
-            text="outlier_percentage",
-            color="outlier_percentage",
-            color_continuous_scale="Blues",
-            height=500
-        )
-        fig_outliers.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
-        fig_outliers.update_layout(xaxis_tickangle=-45, yaxis_tickformat=".2f", margin=dict(t=120, b=100, l=60, r=40))
-        st.plotly_chart(fig_outliers, width='stretch')
+        outlier_chart = chart_rows(outlier_df, "outlier_percentage", "outlier_all")
+        fig_outliers = bar_figure(outlier_chart, "outlier_percentage", "Outlier Percentage by Column", "Blues")
+        st.plotly_chart(fig_outliers, width='stretch', key="outlier_bar")
     else:
         st.info("No numeric outliers detected.")
 
     # ------------------------- Sample Value Inspection -------------------------
     st.subheader("🔠 Column Data Type & Sample Value Inspection")
-    samples = report.get("sample_inspection", {})
-    sample_df = pd.DataFrame([
-        {
-            "Column": col,
-            "Detected Type": info["detected_type"],
-            "Sample Values": ", ".join(map(str, info["sample_values"])),
-            "Notes": info["notes"] or ""
-        }
-        for col, info in samples.items()
-    ])
+    sample_df = report["sample_inspection_table"]
     st.dataframe(sample_df, width='stretch')
 
     # ------------------------- Cardinality -------------------------
     st.subheader("🔢 Categorical Column Cardinality")
-    cardinality = report.get("cardinality", {})
-    if cardinality:
-        card_df = pd.DataFrame(cardinality).T.reset_index().rename(columns={"index": "Column"})
-        card_df["cardinality_percentage"] = pd.to_numeric(card_df["cardinality_percentage"], errors="coerce").fillna(0).round(2)
-        card_df["unique_values"] = pd.to_numeric(card_df["unique_values"], errors="coerce").fillna(0).astype(int)
+    card_df = report["cardinality_table"]
+    if not card_df.empty:
+        card_df["cardinality_percentage"] = card_df["cardinality_percentage"].fillna(0).round(2)
         st.dataframe(card_df, width='stretch')
-        fig_cardinality = px.bar(
-            card_df,
-            x="Column",
-            y="cardinality_percentage",
-            title="Cardinality Percentage by Column",
-            text="cardinality_percentage",
-            color="cardinality_percentage",
-            color_continuous_scale="Purples",
-            height=500
-        )
-        fig_cardinality.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
-        fig_cardinality.update_layout(xaxis_tickangle=-45, yaxis_tickformat=".2f", margin=dict(t=120, b=100, l=60, r=40))
-        st.plotly_chart(fig_cardinality, width='stretch')
+        card_chart = chart_rows(card_df, "cardinality_percentage", "cardinality_all")
+        fig_cardinality = bar_figure(card_chart, "cardinality_percentage", "Cardinality Percentage by Column", "Purples")
+        st.plotly_chart(fig_cardinality, width='stretch', key="cardinality_bar")
     else:
         st.info("No categorical columns found.")
 
     # ------------------------- Download Report -------------------------
     st.subheader("💾 Download Full Report")
 
-    # Generate PDF (text + summary only, no charts)
-    pdf_bytes = checker.get_pdf_bytes()
-    st.download_button(
-        label="📥 Download PDF Report",
-        data=pdf_bytes,
-        file_name="data_quality_report.pdf",
-        mime="application/pdf"
-    )
+    # PDF (text + summary only, no charts) is only rendered on request
+    if st.button("📄 Prepare PDF Report"):
+        with st.spinner("Building PDF..."):
+            pdf_bytes = build_pdf(report, file_name)
+        st.download_button(
+            label="📥 Download PDF Report",
+            data=pdf_bytes,
+            file_name="data_quality_report.pdf",
+            mime="application/pdf",
+            on_click="ignore"
+        )
 
     txt_bytes = io.BytesIO(text_report.encode("utf-8"))
     st.download_button(
@@ -6,6 +6,33 @@ from fpdf import FPDF
 import io
 import plotly.express as px
 
+# Configure logging once at import; basicConfig is a no-op if the root logger already has handlers
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Digits with at most one decimal point, e.g. "42", "3.14", "5." or ".5"
+NUMERIC_LIKE_PATTERN = r"\d+\.?\d*|\.\d+"
+
+
+def read_csv(source):
+    """Read a CSV with the multi-threaded pyarrow parser, falling back to the C parser"""
+    # pyarrow rejects rows shorter than the header and keeps repeated or blank header names;
+    # the C parser pads short rows with NaN and renames them ("a.1", "Unnamed: 1")
+    try:
+        df = pd.read_csv(source, engine="pyarrow")
+        if not (df.columns.duplicated().any() or (df.columns == "").any()):
+            return df
+    except pd.errors.ParserError:
+        pass
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return pd.read_csv(source)
+
+
 class DataQualityChecker:
     def __init__(self, file_path=None, df=None, file_name=None):
         """
@@ -21,12 +48,16 @@ class DataQualityChecker:
         self.file_name = file_name if file_name else (file_path.split("/")[-1] if file_path else "DataFrame")
         self.quality_report = {}
 
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
-        logging.info(f"Initialized DataQualityChecker for: {self.file_name}")
+        # Per-run caches populated by run_all_checks()
+        self._n_rows = None
+        self._null_mask = None
+        self._has_nulls = None
+        self._col_groups = None
+        self._describe = None
+        # Column dtypes as loaded, before text columns are converted to Arrow strings
+        self._source_dtypes = None
+
+        logger.info(f"Initialized DataQualityChecker for: {self.file_name}")
 
     # ---------------------------------------------------------
     # Load data
@@ -34,157 +65,255 @@ class DataQualityChecker:
     def load_data(self):
         """Load dataset from file if no DataFrame provided"""
         if self.df is not None:
+            self._convert_object_columns()
             self.quality_report["basic_info"] = {
                 "file_name": self.file_name,
                 "total_rows": len(self.df),
                 "total_columns": len(self.df.columns),
                 "load_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             }
-            logging.info("Using provided DataFrame.")
+            logger.info("Using provided DataFrame.")
             return True
 
         if not self.file_path:
-            logging.error("No file path or DataFrame provided.")
+            logger.error("No file path or DataFrame provided.")
             return False
 
         try:
             if self.file_path.endswith(".csv"):
-                self.df = pd.read_csv(self.file_path)
+                self.df = read_csv(self.file_path)
             elif self.file_path.endswith(".xlsx"):
-                self.df = pd.read_excel(self.file_path)
+                self.df = pd.read_excel(self.file_path, engine="calamine")
             elif self.file_path.endswith(".parquet"):
                 self.df = pd.read_parquet(self.file_path)
             else:
                 raise ValueError("Unsupported file format. Use CSV, XLSX, or PARQUET.")
 
+            self._convert_object_columns()
             self.quality_report["basic_info"] = {
                 "file_name": self.file_path.split("/")[-1],
                 "total_rows": len(self.df),
                 "total_columns": len(self.df.columns),
                 "load_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             }
-            logging.info("Data loaded successfully from file.")
+            logger.info("Data loaded successfully from file.")
             return True
 
         except Exception as e:
-            logging.error(f"Error loading file: {e}")
+            logger.error(f"Error loading file: {e}")
             print(f"❌ Error loading file: {e}")
             return False
 
+    def _convert_object_columns(self):
+        """Store text columns as Arrow-backed strings so hashing and null checks run over contiguous buffers"""
+        self._source_dtypes = self.df.dtypes.astype(str).to_dict()
+        # Only pure-text columns are converted; mixed-type columns stay object so values like 1 and '1' stay distinct
+        obj_cols = [
+            col for col in self.df.select_dtypes(include=["object"]).columns
+            if pd.api.types.infer_dtype(self.df[col], skipna=True) == "string"
+        ]
+        if len(obj_cols) > 0:
+            # astype returns a new frame, so a DataFrame passed in by the caller is left untouched
+            self.df = self.df.astype({col: "string[pyarrow]" for col in obj_cols})
+
+    # ---------------------------------------------------------
+    # Column groups
+    # ---------------------------------------------------------
+    def _compute_column_groups(self):
+        """Partition columns by dtype"""
+        return {
+            "numeric_columns": self.df.select_dtypes(include=[np.number]).columns,
+            "categorical_columns": self.df.select_dtypes(include=["object", "string"]).columns,
+            "datetime_columns": self.df.select_dtypes(include=["datetime64"]).columns,
+        }
+
     # ---------------------------------------------------------
     # Missing values
     # ---------------------------------------------------------
     def check_missing_values(self):
-        missing_data = self.df.isnull().sum()
-        missing_percentage = (missing_data / len(self.df)) * 100
+        n_rows = self._n_rows or len(self.df)
+        null_mask = self._null_mask if self._null_mask is not None else self.df.isna()
+        has_nulls = self._has_nulls if self._has_nulls is not None else bool(null_mask.any(axis=None))
+        if has_nulls:
+            missing_data = null_mask.sum()
+        else:
+            # Clean frame: skip the per-column reduction
+            missing_data = pd.Series(0, index=self.df.columns)
+        missing_percentage = (missing_data / n_rows) * 100
         self.quality_report["missing_values"] = {
             "total_missing": int(missing_data.sum()),
             "missing_by_column": missing_data.to_dict(),
             "missing_percentage_by_column": missing_percentage.to_dict(),
             "columns_with_missing": missing_data[missing_data > 0].index.tolist(),
         }
-        logging.info("Checked missing values.")
+        # Display-ready table so consumers don't rebuild it from the dicts above
+        self.quality_report["missing_values_table"] = pd.DataFrame({
+            "Column": missing_data.index,
+            "Missing Count": missing_data.to_numpy(),
+            "Missing %": missing_percentage.to_numpy(),
+        })
+        logger.info("Checked missing values.")
 
     # ---------------------------------------------------------
     # Data types
     # ---------------------------------------------------------
     def check_data_types(self):
-        dtypes = self.df.dtypes.astype(str).to_dict()
+        groups = self._col_groups or self._compute_column_groups()
+        dtypes = self._source_dtypes or self.df.dtypes.astype(str).to_dict()
         self.quality_report["data_types"] = {
             "column_types": dtypes,
-            "numeric_columns": self.df.select_dtypes(include=[np.number]).columns.tolist(),
-            "categorical_columns": self.df.select_dtypes(include=["object"]).columns.tolist(),
-            "datetime_columns": self.df.select_dtypes(include=["datetime64"]).columns.tolist(),
+            "numeric_columns": groups["numeric_columns"].tolist(),
+            "categorical_columns": groups["categorical_columns"].tolist(),
+            "datetime_columns": groups["datetime_columns"].tolist(),
         }
-        logging.info("Checked data types.")
+        logger.info("Checked data types.")
 
     # ---------------------------------------------------------
     # Duplicates
     # ---------------------------------------------------------
     def check_duplicates(self):
-        duplicate_rows = self.df.duplicated().sum()
+        n_rows = self._n_rows or len(self.df)
+        duplicate_rows = int(self.df.duplicated().sum())
         self.quality_report["duplicates"] = {
-            "total_duplicate_rows": int(duplicate_rows),
-            "duplicate_percentage": float((duplicate_rows / len(self.df)) * 100),
+            "total_duplicate_rows": duplicate_rows,
+            "duplicate_percentage": float((duplicate_rows / n_rows) * 100) if n_rows else 0.0,
         }
-        logging.info("Checked duplicates.")
+        logger.info("Checked duplicates.")
 
     # ---------------------------------------------------------
     # Outliers
     # ---------------------------------------------------------
     def check_numeric_outliers(self, method="IQR"):
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        n_rows = self._n_rows or len(self.df)
+        groups = self._col_groups or self._compute_column_groups()
+        numeric_cols = groups["numeric_columns"]
         outliers = {}
 
-        for col in numeric_cols:
-            if self.df[col].dropna().empty:
-                continue
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
+        if len(numeric_cols) > 0:
+            # Extract the numeric block once and work on the raw array from here on
+            arr = self.df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+            # All-NaN columns have no quartiles
+            has_values = ~np.isnan(arr).all(axis=0)
+            numeric_cols, arr = numeric_cols[has_values], arr[:, has_values]
+
+        if len(numeric_cols) > 0:
+            # Quartiles from describe() when available, otherwise one pass over all columns
+            if self._describe is not None:
+                Q1 = self._describe.loc["25%", numeric_cols].to_numpy(dtype=np.float64)
+                Q3 = self._describe.loc["75%", numeric_cols].to_numpy(dtype=np.float64)
+            else:
+                Q1, Q3 = np.nanpercentile(arr, [25, 75], axis=0)
             IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            outlier_count = ((self.df[col] < lower_bound) | (self.df[col] > upper_bound)).sum()
-            outliers[col] = {
-                "outlier_count": int(outlier_count),
-                "outlier_percentage": float((outlier_count / len(self.df)) * 100),
-                "lower_bound": float(lower_bound),
-                "upper_bound": float(upper_bound),
+            lower_bounds = Q1 - 1.5 * IQR
+            upper_bounds = Q3 + 1.5 * IQR
+
+            # NaN compares False on both sides, so missing values are never counted
+            mask = (arr < lower_bounds) | (arr > upper_bounds)
+            counts = np.count_nonzero(mask, axis=0)
+
+            outliers = {
+                col: {
+                    "outlier_count": int(count),
+                    "outlier_percentage": float((count / n_rows) * 100),
+                    "lower_bound": float(lb),
+                    "upper_bound": float(ub),
+                }
+                for col, count, lb, ub in zip(numeric_cols, counts, lower_bounds, upper_bounds)
             }
 
         self.quality_report["outliers"] = outliers
-        logging.info("Checked numeric outliers.")
+        logger.info("Checked numeric outliers.")
 
     # ---------------------------------------------------------
     # Column samples
     # ---------------------------------------------------------
     def inspect_column_samples(self, sample_size=3):
+        null_mask = self._null_mask if self._null_mask is not None else self.df.isna()
+        has_nulls = self._has_nulls if self._has_nulls is not None else bool(null_mask.any(axis=None))
+
+        groups = self._col_groups or self._compute_column_groups()
+        object_cols = set(groups["categorical_columns"])
+
+        source_dtypes = self._source_dtypes or self.df.dtypes.astype(str).to_dict()
+
         sample_data = {}
         for col in self.df.columns:
-            dtype = str(self.df[col].dtype)
-            samples = self.df[col].dropna().astype(str).unique()[:sample_size].tolist()
-            if len(samples) == 0:
-                samples = ["<no non-null values>"]
+            dtype = source_dtypes[col]
+            non_null = self.df[col]
+            if has_nulls:
+                non_null = non_null[~null_mask[col].to_numpy()]
+            # Only the sampled values are converted to str, not the whole column
+            sample_strs = non_null.drop_duplicates().iloc[:sample_size].astype(str)
+            samples = sample_strs.tolist()
 
             # Detect numeric-like object columns
             flag = ""
-            if dtype == "object":
-                numeric_like = sum(s.replace(".", "", 1).isdigit() for s in samples)
-                if len(samples) > 0 and (numeric_like / len(samples)) > 0.6:
+            if col in object_cols and len(samples) > 0:
+                numeric_like = sample_strs.str.fullmatch(NUMERIC_LIKE_PATTERN).sum()
+                if (numeric_like / len(samples)) > 0.6:
                     flag = "⚠️ POSSIBLE NUMERIC STORED AS STRING"
 
+            if len(samples) == 0:
+                samples = ["<no non-null values>"]
+
             sample_data[col] = {"detected_type": dtype, "sample_values": samples, "notes": flag}
 
         self.quality_report["sample_inspection"] = sample_data
-        logging.info("Inspected column samples.")
+        # Display-ready table so consumers don't rebuild it from the per-column dicts
+        infos = list(sample_data.values())
+        self.quality_report["sample_inspection_table"] = pd.DataFrame({
+            "Column": list(sample_data.keys()),
+            "Detected Type": [info["detected_type"] for info in infos],
+            "Sample Values": [", ".join(map(str, info["sample_values"])) for info in infos],
+            "Notes": [info["notes"] or "" for info in infos],
+        })
+        logger.info("Inspected column samples.")
 
     # ---------------------------------------------------------
     # Cardinality
     # ---------------------------------------------------------
     def check_cardinality(self):
-        categorical_cols = self.df.select_dtypes(include=["object"]).columns
-        cardinality = {}
-        for col in categorical_cols:
-            unique_count = self.df[col].nunique(dropna=True)
-            cardinality[col] = {
-                "unique_values": int(unique_count),
-                "cardinality_percentage": float((unique_count / len(self.df)) * 100),
-                "high_cardinality": bool(unique_count > (len(self.df) * 0.5)),
+        n_rows = self._n_rows or len(self.df)
+        groups = self._col_groups or self._compute_column_groups()
+        categorical_cols = groups["categorical_columns"]
+        unique_counts = self.df[categorical_cols].nunique(dropna=True)
+        cardinality_percentage = (unique_counts / n_rows) * 100
+        high_cardinality = unique_counts > (n_rows * 0.5)
+        cardinality = {
+            col: {
+                "unique_values": int(count),
+                "cardinality_percentage": float(pct),
+                "high_cardinality": bool(high),
             }
+            for col, count, pct, high in zip(
+                categorical_cols, unique_counts.to_numpy(), cardinality_percentage.to_numpy(), high_cardinality.to_numpy()
+            )
+        }
         self.quality_report["cardinality"] = cardinality
-        logging.info("Checked cardinality.")
+        # Display-ready table so consumers don't rebuild it from the per-column dicts
+        self.quality_report["cardinality_table"] = pd.DataFrame({
+            "Column": categorical_cols,
+            "unique_values": unique_counts.to_numpy(),
+            "cardinality_percentage": cardinality_percentage.to_numpy(),
+            "high_cardinality": high_cardinality.to_numpy(),
+        })
+        logger.info("Checked cardinality.")
 
     # ---------------------------------------------------------
     # Summary statistics
     # ---------------------------------------------------------
     def generate_summary_statistics(self):
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        groups = self._col_groups or self._compute_column_groups()
+        numeric_cols = groups["numeric_columns"]
+        # Kept for check_numeric_outliers, which reuses the quartiles
+        self._describe = self.df[numeric_cols].describe()
         self.quality_report["summary_statistics"] = {
-            "describe": self.df[numeric_cols].describe().to_dict(),
+            "describe": self._describe.to_dict(),
             "skewness": self.df[numeric_cols].skew().to_dict(),
             "kurtosis": self.df[numeric_cols].kurtosis().to_dict(),
         }
-        logging.info("Generated summary statistics.")
+        logger.info("Generated summary statistics.")
 
     # ---------------------------------------------------------
     # Run all checks
@@ -192,14 +321,23 @@ class DataQualityChecker:
     def run_all_checks(self):
         if not self.load_data():
             return None
+
+        # Shared by several checks; computed once per run
+        self._n_rows = len(self.df)
+        self._null_mask = self.df.isna()
+        self._has_nulls = bool(self._null_mask.any(axis=None))
+        self._col_groups = self._compute_column_groups()
+        self._describe = None
+
         self.check_missing_values()
         self.check_data_types()
         self.check_duplicates()
+        # Summary statistics first so outlier detection can reuse its quartiles
+        self.generate_summary_statistics()
         self.check_numeric_outliers()
         self.check_cardinality()
-        self.generate_summary_statistics()
         self.inspect_column_samples()
-        logging.info("All checks completed.")
+        logger.info("All checks completed.")
         return self.quality_report
 
     # ---------------------------------------------------------
@@ -214,28 +352,34 @@ class DataQualityChecker:
         dupes = self.quality_report["duplicates"]
         samples = self.quality_report.get("sample_inspection", {})
 
-        report = []
-        report.append("=" * 60)
-        report.append("DATA QUALITY REPORT")
-        report.append("=" * 60)
-        report.append(f"File: {basic['file_name']}")
-        report.append(f"Rows: {basic['total_rows']:,}")
-        report.append(f"Columns: {basic['total_columns']}")
-        report.append(f"Generated: {basic['load_timestamp']}\n")
-        report.append(f"Total Missing: {missing['total_missing']:,}")
-        report.append(f"Columns with Missing: {len(missing['columns_with_missing'])}")
-        report.append(f"Duplicate Rows: {dupes['total_duplicate_rows']:,} ({dupes['duplicate_percentage']:.1f}%)")
-        report.append("=" * 60)
-        report.append("\nCOLUMN SAMPLE VALUES")
-        report.append("-" * 60)
+        buf = io.StringIO()
+        w = buf.write
+        w("=" * 60 + "\n")
+        w("DATA QUALITY REPORT\n")
+        w("=" * 60 + "\n")
+        w(f"File: {basic['file_name']}\n")
+        w(f"Rows: {basic['total_rows']:,}\n")
+        w(f"Columns: {basic['total_columns']}\n")
+        w(f"Generated: {basic['load_timestamp']}\n\n")
+        w(f"Total Missing: {missing['total_missing']:,}\n")
+        w(f"Columns with Missing: {len(missing['columns_with_missing'])}\n")
+        w(f"Duplicate Rows: {dupes['total_duplicate_rows']:,} ({dupes['duplicate_percentage']:.1f}%)\n")
+        w("=" * 60 + "\n")
+        w("\nCOLUMN SAMPLE VALUES\n")
+        w("-" * 60)
 
+        # Format the whole sample section in one pass and write it as a single block
+        sample_lines = []
         for col, info in samples.items():
-            report.append(f"{col} ({info['detected_type']}): {info['sample_values']}")
+            sample_lines.append(f"{col} ({info['detected_type']}): {info['sample_values']}")
             if info["notes"]:
-                report.append(f"  ⚠️ {info['notes']}")
-            report.append("")
+                sample_lines.append(f"  ⚠️ {info['notes']}")
+            sample_lines.append("")
+        if sample_lines:
+            w("\n")
+            w("\n".join(sample_lines))
 
-        return "\n".join(report)
+        return buf.getvalue()
 
     # ---------------------------------------------------------
     # Get PDF bytes (text + charts + summary stats)
@@ -250,7 +394,8 @@ class DataQualityChecker:
         # ------------------ Text report ------------------
         text_report = self.generate_text_report()
         for line in text_report.split("\n"):
-            pdf.multi_cell(0, 5, line)
+            # FPDF core fonts are latin-1 only; replace anything else (e.g. emoji)
+            pdf.multi_cell(0, 5, line.encode("latin-1", "replace").decode("latin-1"))
 
         # ------------------ Summary statistics ------------------
         summary = self.quality_report.get("summary_statistics", {}).get("describe", {})
@@ -261,13 +406,15 @@ class DataQualityChecker:
             pdf.set_font("Courier", size=10)
             pdf.ln(5)
 
-            df_summary = pd.DataFrame(summary).reset_index().rename(columns={"index": "Metric"}).round(2)
-            col_width = 25
+            df_summary = pd.DataFrame(summary).round(2)
+
+            # Courier is monospaced, so a pre-formatted text table lines up without per-cell layout.
+            # line_width makes pandas split wide tables into blocks of columns that fit the page;
+            # the metric names stay in the index so every block repeats them.
+            page_chars = int((pdf.w - pdf.l_margin - pdf.r_margin - 2 * pdf.c_margin) / pdf.get_string_width("0"))
+            text_table = df_summary.to_string(line_width=page_chars)
             row_height = 6
-            for i, row in df_summary.iterrows():
-                for col in df_summary.columns:
-                    pdf.cell(col_width, row_height, txt=str(row[col])[:12], border=1)
-                pdf.ln(row_height)
+            pdf.multi_cell(0, row_height, text_table.encode("latin-1", "replace").decode("latin-1"))
 
         # ------------------ Return as BytesIO ------------------
         pdf_bytes = pdf.output(dest='S').encode('latin1')  # Return PDF as bytes